@@ -6,9 +6,10 @@ import hydra
 from omegaconf import DictConfig, OmegaConf
 
 
-num_envs = 64
+default_num_envs = 4096  # used unless num_envs is set on the command line
 @hydra.main(version_base="1.1", config_name="config", config_path="./cfg")
 def play(cfg: DictConfig):
+    num_envs = cfg.num_envs if cfg.num_envs else default_num_envs
     envs = isaacgymenvs.make(
         seed=0, 
         task="XarmTask", 
@@ -30,8 +31,9 @@ def play(cfg: DictConfig):
     )
     envs.reset()
     print("the image of Isaac Gym viewer is an array of shape", envs.render(mode="rgb_array").shape)
+    actions = torch.empty((num_envs,) + envs.action_space.shape, device = 'cuda:0')
     for _ in range(100):
-        actions = 2.0 * torch.rand((num_envs,) + envs.action_space.shape, device = 'cuda:0') - 1.0
+        actions.uniform_(-1.0, 1.0)
         envs.step(actions)
         
 if __name__ == "__main__":
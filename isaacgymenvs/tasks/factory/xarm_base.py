@@ -445,7 +445,6 @@ class XarmBase(VecTask, FactoryABCBase):
             ctrl_target_wrist_quat=self.ctrl_target_wrist_quat,
             ctrl_target_gripper_dof_pos=self.ctrl_target_gripper_dof_pos,
             device=self.device)
-        print('ctrl_target_dof_pos',self.ctrl_target_dof_pos.shape)
 
         self.gym.set_dof_position_target_tensor_indexed(self.sim,
                                                         gymtorch.unwrap_tensor(self.ctrl_target_dof_pos),
@@ -44,6 +44,7 @@ from isaacgymenvs.tasks.factory.xarm_env import XarmEnv
 from isaacgymenvs.tasks.factory.factory_schema_class_task import FactoryABCTask
 from isaacgymenvs.tasks.factory.factory_schema_config_task import FactorySchemaConfigTask
 from isaacgymenvs.utils import torch_jit_utils
+from isaacgymenvs.utils.torch_jit_utils import quat_from_angle_axis, quat_mul
 
 
 class XarmTask(XarmEnv, FactoryABCTask):
@@ -64,6 +65,15 @@ class XarmTask(XarmEnv, FactoryABCTask):
         if self.viewer is not None:
             self._set_viewer_params()
 
+        self._step_in_episode = 0  # host-side copy of progress_buf (all envs share episode length)
+        self._reset_pending = True  # reset_buf is initialized to ones by VecTask
+        self._all_env_ids = torch.arange(self.num_envs, device=self.device)
+
+        # CUDA graph for per-step tensor ops; captured lazily in post_physics_step
+        self._use_step_graph = self.cfg_task.env.use_cuda_graph and 'cuda' in str(self.device)
+        self._step_graph = None
+        self._step_graph_warmup_steps = 0
+
     def _get_task_yaml_params(self):
         """Initialize instance variables from YAML files."""
 
@@ -99,9 +109,63 @@ class XarmTask(XarmEnv, FactoryABCTask):
                                              device=self.device)
         self.keypoints_nut = torch.zeros_like(self.keypoints_gripper, device=self.device)
 
+        # Keypoint offsets broadcast over envs for batched transforms
+        self._offsets_per_env = self.keypoint_offsets.unsqueeze(0).expand(self.num_envs, -1, -1).contiguous()
+
         self.identity_quat = torch.tensor([0.0, 0.0, 0.0, 1.0], device=self.device).unsqueeze(0).repeat(self.num_envs,
                                                                                                         1)
 
+        # Constant tensors built from config (avoid host-to-device copies on every reset and step)
+        self._identity_quat_1 = torch.tensor([0.0, 0.0, 0.0, 1.0], dtype=torch.float32, device=self.device)
+        self._franka_initial_dof_pos = torch.cat(
+            (torch.tensor(self.cfg_task.randomize.franka_arm_initial_dof_pos, device=self.device),
+             torch.tensor(self.cfg_task.randomize.hand_initial_dof_pos, device=self.device)),
+            dim=-1)  # shape = (num_dofs,)
+        self._nut_pos_xy_noise_diag = torch.diag(
+            torch.tensor(self.cfg_task.randomize.nut_pos_xy_initial_noise, dtype=torch.float32, device=self.device))
+        self._bolt_pos_xy_noise_diag = torch.diag(
+            torch.tensor(self.cfg_task.randomize.bolt_pos_xy_noise, dtype=torch.float32, device=self.device))
+
+        # Column ranges in obs_buf of wrist pos, quat, linvel, angvel and nut grasp pos, quat
+        self._obs_slices = [(0, 3), (3, 7), (7, 10), (10, 13), (13, 16), (16, 20)]
+
+        self.actions = torch.zeros((self.num_envs, self.cfg_task.env.numActions), device=self.device)
+        self._zero_delta_hand_pose = torch.zeros((self.num_envs, self.cfg_task.env.numActions), device=self.device)
+        self._gripper_dof_pos_override = torch.zeros((self.num_envs, self.num_hand_dofs), device=self.device)
+
+        # Gripper pose randomization tensors
+        self._gripper_rand_target_base = \
+            torch.tensor([0.0, 0.0, self.cfg_base.env.table_height], device=self.device) \
+            + torch.tensor(self.cfg_task.randomize.fingertip_midpoint_pos_initial, device=self.device)
+        self._gripper_rand_pos_noise_diag = torch.diag(
+            torch.tensor(self.cfg_task.randomize.fingertip_midpoint_pos_noise, dtype=torch.float32, device=self.device))
+        self._gripper_rand_euler_base = torch.tensor(self.cfg_task.randomize.fingertip_midpoint_rot_initial,
+                                                     dtype=torch.float32, device=self.device)
+        self._gripper_rand_rot_noise_diag = torch.diag(
+            torch.tensor(self.cfg_task.randomize.fingertip_midpoint_rot_noise, dtype=torch.float32, device=self.device))
+        self._rand_actions = torch.zeros((self.num_envs, self.cfg_task.env.numActions), device=self.device)
+
+        # Nominal root states (pos, quat, linvel, angvel) of nut and bolt before XY noise is added
+        self._nut_reset_root_state = torch.zeros((self.num_envs, 13), dtype=torch.float32, device=self.device)
+        self._nut_reset_root_state[:, 0:2] = torch.tensor(self.cfg_task.randomize.nut_pos_xy_initial,
+                                                          dtype=torch.float32, device=self.device)
+        self._nut_reset_root_state[:, 2] = self.cfg_base.env.table_height - self.bolt_head_heights.squeeze(-1)
+        self._nut_reset_root_state[:, 3:7] = self._identity_quat_1
+        self._bolt_reset_root_state = torch.zeros((self.num_envs, 13), dtype=torch.float32, device=self.device)
+        self._bolt_reset_root_state[:, 0:2] = torch.tensor(self.cfg_task.randomize.bolt_pos_xy_initial,
+                                                           dtype=torch.float32, device=self.device)
+        self._bolt_reset_root_state[:, 2] = self.cfg_base.env.table_height
+        self._bolt_reset_root_state[:, 3:7] = self._identity_quat_1
+
+        self._pos_action_scale_diag = torch.diag(
+            torch.tensor(self.cfg_task.rl.pos_action_scale, dtype=torch.float32, device=self.device))
+        self._rot_action_scale_diag = torch.diag(
+            torch.tensor(self.cfg_task.rl.rot_action_scale, dtype=torch.float32, device=self.device))
+        self._force_action_scale_diag = torch.diag(
+            torch.tensor(self.cfg_task.rl.force_action_scale, dtype=torch.float32, device=self.device))
+        self._torque_action_scale_diag = torch.diag(
+            torch.tensor(self.cfg_task.rl.torque_action_scale, dtype=torch.float32, device=self.device))
+
     def _refresh_task_tensors(self):
         """Refresh tensors."""
 
@@ -112,24 +176,25 @@ class XarmTask(XarmEnv, FactoryABCTask):
                                                                              self.nut_grasp_pos_local)
 
         # Compute pos of keypoints on gripper and nut in world frame
-        for idx, keypoint_offset in enumerate(self.keypoint_offsets):
-            self.keypoints_gripper[:, idx] = torch_jit_utils.tf_combine(self.wrist_quat,
-                                                                        self.wrist_pos,
-                                                                        self.identity_quat,
-                                                                        keypoint_offset.repeat(self.num_envs, 1))[1]
-            self.keypoints_nut[:, idx] = torch_jit_utils.tf_combine(self.nut_grasp_quat,
-                                                                    self.nut_grasp_pos,
-                                                                    self.identity_quat,
-                                                                    keypoint_offset.repeat(self.num_envs, 1))[1]
+        # (keypoints are offset from an identity-rotated frame, so tf_combine reduces to tf_apply)
+        num_keypoints = self.cfg_task.rl.num_keypoints
+        self.keypoints_gripper[:] = torch_jit_utils.tf_apply(
+            self.wrist_quat.unsqueeze(1).expand(-1, num_keypoints, -1),
+            self.wrist_pos.unsqueeze(1),
+            self._offsets_per_env)
+        self.keypoints_nut[:] = torch_jit_utils.tf_apply(
+            self.nut_grasp_quat.unsqueeze(1).expand(-1, num_keypoints, -1),
+            self.nut_grasp_pos.unsqueeze(1),
+            self._offsets_per_env)
 
     def pre_physics_step(self, actions):
         """Reset environments. Apply actions from policy. Simulation step called after this method."""
 
-        env_ids = self.reset_buf.nonzero(as_tuple=False).squeeze(-1)
-        if len(env_ids) > 0:
-            self.reset_idx(env_ids)
+        # All envs share episode length, so resets are known on host; skip scanning reset_buf on other steps
+        if self._reset_pending:
+            self.reset_idx(self._all_env_ids)
 
-        self.actions = actions.clone().to(self.device)  # shape = (num_envs, num_actions); values = [-1, 1]
+        self.actions.copy_(actions)  # shape = (num_envs, num_actions); values = [-1, 1]
 
         self._apply_actions_as_ctrl_targets(actions=self.actions,do_scale=True)
 
@@ -137,21 +202,58 @@ class XarmTask(XarmEnv, FactoryABCTask):
         """Step buffers. Refresh tensors. Compute observations and reward. Reset environments."""
 
         self.progress_buf[:] += 1
-
-        # In this policy, episode length is constant
-        is_last_step = (self.progress_buf[0] == self.max_episode_length - 1)
+        self._step_in_episode += 1
 
         if self.cfg_task.env.close_and_lift:
             # At this point, robot has executed RL policy. Now close gripper and lift (open-loop)
-            if is_last_step:
+            if self._is_last_step():
                 #self._close_gripper(sim_steps=self.cfg_task.env.num_gripper_close_sim_steps)
                 self._lift_gripper(sim_steps=self.cfg_task.env.num_gripper_lift_sim_steps)
 
         self.refresh_base_tensors()
         self.refresh_env_tensors()
+        # NOTE: obs_buf and rew_buf are read by VecTask.step as soon as this method returns, so these ops stay on
+        # the current stream; moving them to a side stream would only add a wait with nothing to overlap.
+        if self._use_step_graph:
+            self._replay_step_graph()
+        else:
+            self._compute_step_tensors()
+        self._add_success_bonus()
+
+        # Mirrors _update_reset_buf (max episode length reached)
+        self._reset_pending = self._step_in_episode >= self.max_episode_length - 1
+
+    def _compute_step_tensors(self):
+        """Refresh task tensors. Compute observations, reset buffer, and dense reward (tensor ops only)."""
+
         self._refresh_task_tensors()
         self.compute_observations()
-        self.compute_reward()
+        self._update_reset_buf()
+        self._update_dense_rew_buf()
+
+    def _replay_step_graph(self):
+        """Run per-step tensor ops through a CUDA graph. Capture graph after a few eager warmup steps."""
+
+        if self._step_graph is None:
+            if self._step_graph_warmup_steps < 3:
+                # Warm up on side stream (TorchScript profiling, cuBLAS init) before capture
+                side_stream = torch.cuda.Stream(device=self.device)
+                side_stream.wait_stream(torch.cuda.current_stream(device=self.device))
+                with torch.cuda.stream(side_stream):
+                    self._compute_step_tensors()
+                torch.cuda.current_stream(device=self.device).wait_stream(side_stream)
+                self._step_graph_warmup_steps += 1
+                return
+
+            self._step_graph = torch.cuda.CUDAGraph()
+            with torch.cuda.graph(self._step_graph):
+                self._compute_step_tensors()
+            self._step_graph_outputs = (self.nut_grasp_quat, self.nut_grasp_pos)
+
+        self._step_graph.replay()
+
+        # Eager calls (e.g., during reset) may rebind these attributes; point them back to graph outputs
+        self.nut_grasp_quat, self.nut_grasp_pos = self._step_graph_outputs
 
     def compute_observations(self):
         """Compute observations."""
@@ -164,7 +266,9 @@ class XarmTask(XarmEnv, FactoryABCTask):
                        self.nut_grasp_pos,
                        self.nut_grasp_quat]
 
-        self.obs_buf = torch.cat(obs_tensors, dim=-1)  # shape = (num_envs, num_observations)
+        # Write into preallocated obs_buf; shape = (num_envs, num_observations)
+        for obs_tensor, (start, end) in zip(obs_tensors, self._obs_slices):
+            self.obs_buf[:, start:end].copy_(obs_tensor)
 
         return self.obs_buf
 
@@ -172,98 +276,90 @@ class XarmTask(XarmEnv, FactoryABCTask):
         """Update reward and reset buffers."""
 
         self._update_reset_buf()
-        self._update_rew_buf()
+        self._update_dense_rew_buf()
+        self._add_success_bonus()
 
     def _update_reset_buf(self):
         """Assign environments for reset if successful or failed."""
 
         # If max episode length has been reached
-        self.reset_buf[:] = torch.where(self.progress_buf[:] >= self.max_episode_length - 1,
-                                        torch.ones_like(self.reset_buf),
-                                        self.reset_buf)
+        self.reset_buf |= (self.progress_buf >= self.max_episode_length - 1).to(self.reset_buf.dtype)
 
-    def _update_rew_buf(self):
-        """Compute reward at current timestep."""
+    def _update_dense_rew_buf(self):
+        """Compute keypoint reward and action penalty at current timestep."""
 
-        keypoint_reward = -self._get_keypoint_dist()
-        action_penalty = torch.norm(self.actions, p=2, dim=-1) * self.cfg_task.rl.action_penalty_scale
+        self.rew_buf.copy_(compute_xarm_reward(self.keypoints_nut,
+                                               self.keypoints_gripper,
+                                               self.actions,
+                                               self.cfg_task.rl.keypoint_reward_scale,
+                                               self.cfg_task.rl.action_penalty_scale))
 
-        self.rew_buf[:] = keypoint_reward * self.cfg_task.rl.keypoint_reward_scale \
-                          - action_penalty * self.cfg_task.rl.action_penalty_scale
+    def _add_success_bonus(self):
+        """Add success bonus to reward at last step of episode."""
 
-        # In this policy, episode length is constant across all envs
-        is_last_step = (self.progress_buf[0] == self.max_episode_length - 1)
-
-        if is_last_step:
+        if self._is_last_step():
             # Check if nut is picked up and above table
             lift_success = self._check_lift_success(height_multiple=3.0)
             self.rew_buf[:] += lift_success * self.cfg_task.rl.success_bonus
             self.extras['successes'] = torch.mean(lift_success.float())
 
+    def _is_last_step(self):
+        """Check if current step is last step of episode. Tracked on host to avoid reading progress_buf."""
+
+        # In this policy, episode length is constant across all envs
+        return self._step_in_episode == self.max_episode_length - 1
+
     def reset_idx(self, env_ids):
         """Reset specified environments."""
 
+        franka_actor_ids_sim = self.franka_actor_ids_sim[env_ids].flatten()
+
+        # Initial DOF state must reach the sim before the gripper is moved to a random pose
         self._reset_franka(env_ids)
+        self._set_franka_dof_state(franka_actor_ids_sim)
         self._reset_object(env_ids)
 
         self._randomize_gripper_pose(env_ids, sim_steps=self.cfg_task.env.num_gripper_move_sim_steps)
+        self._set_franka_dof_state(franka_actor_ids_sim)
 
         self._reset_buffers(env_ids)
 
     def _reset_franka(self, env_ids):
         """Reset DOF states and DOF targets of Franka."""
 
-        self.dof_pos[env_ids] = torch.cat(
-            (torch.tensor(self.cfg_task.randomize.franka_arm_initial_dof_pos, device=self.device),
-             torch.tensor(self.cfg_task.randomize.hand_initial_dof_pos, device=self.device)),
-            dim=-1).unsqueeze(0).repeat((self.num_envs, 1))  # shape = (num_envs, num_dofs)
+        # Initial DOF pos of shape (num_dofs,) is broadcast over reset envs; no (num_envs, num_dofs) copy is built
+        self.dof_pos[env_ids] = self._franka_initial_dof_pos  # shape = (num_envs, num_dofs)
         self.dof_vel[env_ids] = 0.0  # shape = (num_envs, num_dofs)
-        self.ctrl_target_dof_pos[env_ids] = self.dof_pos[env_ids]
+        self.ctrl_target_dof_pos[env_ids] = self._franka_initial_dof_pos
+
+    def _set_franka_dof_state(self, franka_actor_ids_sim):
+        """Write DOF states of specified Franka actors to sim."""
 
-        multi_env_ids_int32 = self.franka_actor_ids_sim[env_ids].flatten()
         self.gym.set_dof_state_tensor_indexed(self.sim,
                                               gymtorch.unwrap_tensor(self.dof_state),
-                                              gymtorch.unwrap_tensor(multi_env_ids_int32),
-                                              len(multi_env_ids_int32))
+                                              gymtorch.unwrap_tensor(franka_actor_ids_sim),
+                                              len(franka_actor_ids_sim))
 
     def _reset_object(self, env_ids):
         """Reset root states of nut and bolt."""
 
-        # shape of root_pos = (num_envs, num_actors, 3)
-        # shape of root_quat = (num_envs, num_actors, 4)
-        # shape of root_linvel = (num_envs, num_actors, 3)
-        # shape of root_angvel = (num_envs, num_actors, 3)
+        # shape of root_state = (num_envs, num_actors, 13) = pos (3), quat (4), linvel (3), angvel (3)
+        # Each actor's full root state is written with a single indexed assignment
+
+        num_resets = len(env_ids)
+        root_state = self.root_state.view(self.num_envs, self.num_actors, 13)
 
         # Randomize root state of nut
-        nut_noise_xy = 2 * (torch.rand((self.num_envs, 2), dtype=torch.float32, device=self.device) - 0.5)  # [-1, 1]
-        nut_noise_xy = nut_noise_xy @ torch.diag(
-            torch.tensor(self.cfg_task.randomize.nut_pos_xy_initial_noise, device=self.device))
-        self.root_pos[env_ids, self.nut_actor_id_env, 0] = self.cfg_task.randomize.nut_pos_xy_initial[0] + nut_noise_xy[
-            env_ids, 0]
-        self.root_pos[env_ids, self.nut_actor_id_env, 1] = self.cfg_task.randomize.nut_pos_xy_initial[1] + nut_noise_xy[
-            env_ids, 1]
-        self.root_pos[
-            env_ids, self.nut_actor_id_env, 2] = self.cfg_base.env.table_height - self.bolt_head_heights.squeeze(-1)
-        self.root_quat[env_ids, self.nut_actor_id_env] = torch.tensor([0.0, 0.0, 0.0, 1.0], dtype=torch.float32,
-                                                                      device=self.device).repeat(len(env_ids), 1)
-
-        self.root_linvel[env_ids, self.nut_actor_id_env] = 0.0
-        self.root_angvel[env_ids, self.nut_actor_id_env] = 0.0
+        nut_noise_xy = 2 * (torch.rand((num_resets, 2), dtype=torch.float32, device=self.device) - 0.5)  # [-1, 1]
+        nut_root_state = self._nut_reset_root_state[env_ids]
+        nut_root_state[:, 0:2] += nut_noise_xy @ self._nut_pos_xy_noise_diag
+        root_state[env_ids, self.nut_actor_id_env] = nut_root_state
 
         # Randomize root state of bolt
-        bolt_noise_xy = 2 * (torch.rand((self.num_envs, 2), dtype=torch.float32, device=self.device) - 0.5)  # [-1, 1]
-        bolt_noise_xy = bolt_noise_xy @ torch.diag(
-            torch.tensor(self.cfg_task.randomize.bolt_pos_xy_noise, device=self.device))
-        self.root_pos[env_ids, self.bolt_actor_id_env, 0] = self.cfg_task.randomize.bolt_pos_xy_initial[0] + \
-                                                            bolt_noise_xy[env_ids, 0]
-        self.root_pos[env_ids, self.bolt_actor_id_env, 1] = self.cfg_task.randomize.bolt_pos_xy_initial[1] + \
-                                                            bolt_noise_xy[env_ids, 1]
-        self.root_pos[env_ids, self.bolt_actor_id_env, 2] = self.cfg_base.env.table_height
-        self.root_quat[env_ids, self.bolt_actor_id_env] = torch.tensor([0.0, 0.0, 0.0, 1.0], dtype=torch.float32,
-                                                                       device=self.device).repeat(len(env_ids), 1)
-
-        self.root_linvel[env_ids, self.bolt_actor_id_env] = 0.0
-        self.root_angvel[env_ids, self.bolt_actor_id_env] = 0.0
+        bolt_noise_xy = 2 * (torch.rand((num_resets, 2), dtype=torch.float32, device=self.device) - 0.5)  # [-1, 1]
+        bolt_root_state = self._bolt_reset_root_state[env_ids]
+        bolt_root_state[:, 0:2] += bolt_noise_xy @ self._bolt_pos_xy_noise_diag
+        root_state[env_ids, self.bolt_actor_id_env] = bolt_root_state
 
         nut_bolt_actor_ids_sim = torch.cat((self.nut_actor_ids_sim[env_ids],
                                             self.bolt_actor_ids_sim[env_ids]),
@@ -278,6 +374,9 @@ class XarmTask(XarmEnv, FactoryABCTask):
 
         self.reset_buf[env_ids] = 0
         self.progress_buf[env_ids] = 0
+        if len(env_ids) == self.num_envs:
+            self._step_in_episode = 0
+            self._reset_pending = False
 
     def _set_viewer_params(self):
         """Set viewer parameters."""
@@ -286,47 +385,38 @@ class XarmTask(XarmEnv, FactoryABCTask):
         cam_target = gymapi.Vec3(0.0, 0.0, 0.5)
         self.gym.viewer_camera_look_at(self.viewer, None, cam_pos, cam_target)
 
-    def _apply_actions_as_ctrl_targets(self, actions,  do_scale):
-        """Apply actions from policy as position/rotation targets."""
-
-        # Interpret actions as target pos displacements and set pos target
-        pos_actions = actions[:, 0:3]
-        if do_scale:
-            pos_actions = pos_actions @ torch.diag(torch.tensor(self.cfg_task.rl.pos_action_scale, device=self.device))
-        self.ctrl_target_wrist_pos = self.wrist_pos + pos_actions
-        print('wrist_pos',self.wrist_pos[0])
-
-        # Interpret actions as target rot (axis-angle) displacements
-        rot_actions = actions[:, 3:6]
-        if do_scale:
-            rot_actions = rot_actions @ torch.diag(torch.tensor(self.cfg_task.rl.rot_action_scale, device=self.device))
-
-        # Convert to quat and set rot target
-        angle = torch.norm(rot_actions, p=2, dim=-1)
-        axis = rot_actions / angle.unsqueeze(-1)
-        rot_actions_quat = torch_utils.quat_from_angle_axis(angle, axis)
-        if self.cfg_task.rl.clamp_rot:
-            rot_actions_quat = torch.where(angle.unsqueeze(-1).repeat(1, 4) > self.cfg_task.rl.clamp_rot_thresh,
-                                           rot_actions_quat,
-                                           torch.tensor([0.0, 0.0, 0.0, 1.0], device=self.device).repeat(self.num_envs,
-                                                                                                         1))
-        self.ctrl_target_wrist_quat = torch_utils.quat_mul(rot_actions_quat, self.wrist_quat)
+    def _apply_actions_as_ctrl_targets(self, actions, do_scale, gripper_dof_pos_override=None):
+        """Apply actions from policy as position/rotation targets. Optionally override gripper DOF targets."""
+
+        # Interpret actions as target pos/rot (axis-angle) displacements and set pos/rot targets
+        self.ctrl_target_wrist_pos, self.ctrl_target_wrist_quat = compute_wrist_ctrl_targets(
+            actions=actions,
+            wrist_pos=self.wrist_pos,
+            wrist_quat=self.wrist_quat,
+            pos_action_scale_diag=self._pos_action_scale_diag,
+            rot_action_scale_diag=self._rot_action_scale_diag,
+            identity_quat=self._identity_quat_1,
+            do_scale=do_scale,
+            clamp_rot=self.cfg_task.rl.clamp_rot,
+            clamp_rot_thresh=self.cfg_task.rl.clamp_rot_thresh)
 
         if self.cfg_ctrl['do_force_ctrl']:
             # Interpret actions as target forces and target torques
             force_actions = actions[:, 6:9]
             if do_scale:
-                force_actions = force_actions @ torch.diag(
-                    torch.tensor(self.cfg_task.rl.force_action_scale, device=self.device))
+                force_actions = force_actions @ self._force_action_scale_diag
 
             torque_actions = actions[:, 9:12]
             if do_scale:
-                torque_actions = torque_actions @ torch.diag(
-                    torch.tensor(self.cfg_task.rl.torque_action_scale, device=self.device))
+                torque_actions = torque_actions @ self._torque_action_scale_diag
 
             self.ctrl_target_fingertip_contact_wrench = torch.cat((force_actions, torque_actions), dim=-1)
 
-        self.ctrl_target_gripper_dof_pos = actions[:, -16:]
+        if gripper_dof_pos_override is not None:
+            self._gripper_dof_pos_override.fill_(gripper_dof_pos_override)
+            self.ctrl_target_gripper_dof_pos = self._gripper_dof_pos_override
+        else:
+            self.ctrl_target_gripper_dof_pos = actions[:, -self.num_hand_dofs:]
 
         self.generate_ctrl_signals()
 
@@ -341,7 +431,7 @@ class XarmTask(XarmEnv, FactoryABCTask):
     def _get_keypoint_dist(self):
         """Get keypoint distance."""
 
-        keypoint_dist = torch.sum(torch.norm(self.keypoints_nut - self.keypoints_gripper, p=2, dim=-1), dim=-1)
+        keypoint_dist = compute_keypoint_dist(self.keypoints_nut, self.keypoints_gripper)
 
         return keypoint_dist
 
@@ -353,9 +443,9 @@ class XarmTask(XarmEnv, FactoryABCTask):
     def _move_gripper_to_dof_pos(self, gripper_dof_pos, sim_steps=20):
         """Move gripper fingers to specified DOF position using controller."""
 
-        delta_hand_pose = torch.zeros((self.num_envs, self.cfg_task.env.numActions),
-                                      device=self.device)  # No hand motion
-        self._apply_actions_as_ctrl_targets(delta_hand_pose, gripper_dof_pos, do_scale=False)
+        self._apply_actions_as_ctrl_targets(self._zero_delta_hand_pose,  # No hand motion
+                                            do_scale=False,
+                                            gripper_dof_pos_override=gripper_dof_pos)
 
         # Step sim
         for _ in range(sim_steps):
@@ -365,23 +455,22 @@ class XarmTask(XarmEnv, FactoryABCTask):
     def _lift_gripper(self, franka_gripper_width=0.0, lift_distance=0.3, sim_steps=20):
         """Lift gripper by specified distance. Called outside RL loop (i.e., after last step of episode)."""
 
-        delta_hand_pose = torch.zeros([self.num_envs, 6], device=self.device)
+        delta_hand_pose = torch.zeros((self.num_envs, self.cfg_task.env.numActions), device=self.device)
         delta_hand_pose[:, 2] = lift_distance
 
         # Step sim
-        for i in range(sim_steps):
-            print('lift',i)
-            self._apply_actions_as_ctrl_targets(delta_hand_pose, do_scale=False)
+        for _ in range(sim_steps):
+            self._apply_actions_as_ctrl_targets(delta_hand_pose,
+                                                do_scale=False,
+                                                gripper_dof_pos_override=franka_gripper_width)
             self.render()
             self.gym.simulate(self.sim)
 
     def _check_lift_success(self, height_multiple):
         """Check if nut is above table by more than specified multiple times height of nut."""
 
-        lift_success = torch.where(
-            self.nut_pos[:, 2] > self.cfg_base.env.table_height + self.nut_heights.squeeze(-1) * height_multiple,
-            torch.ones((self.num_envs,), device=self.device),
-            torch.zeros((self.num_envs,), device=self.device))
+        lift_success = (self.nut_pos[:, 2] > self.cfg_base.env.table_height
+                        + self.nut_heights.squeeze(-1) * height_multiple).to(self.rew_buf.dtype)
 
         return lift_success
 
@@ -389,34 +478,23 @@ class XarmTask(XarmEnv, FactoryABCTask):
         """Move gripper to random pose."""
 
         # Set target pos above table
-        self.ctrl_target_wrist_pos = \
-            torch.tensor([0.0, 0.0, self.cfg_base.env.table_height], device=self.device) \
-            + torch.tensor(self.cfg_task.randomize.fingertip_midpoint_pos_initial, device=self.device)
-        self.ctrl_target_wrist_pos = self.ctrl_target_wrist_pos.unsqueeze(0).repeat(self.num_envs, 1)
-
         wrist_pos_noise = \
             2 * (torch.rand((self.num_envs, 3), dtype=torch.float32, device=self.device) - 0.5)  # [-1, 1]
-        wrist_pos_noise = \
-            wrist_pos_noise @ torch.diag(torch.tensor(self.cfg_task.randomize.fingertip_midpoint_pos_noise,
-                                                                   device=self.device))
-        self.ctrl_target_wrist_pos += wrist_pos_noise
+        self.ctrl_target_wrist_pos = self._gripper_rand_target_base \
+                                     + wrist_pos_noise @ self._gripper_rand_pos_noise_diag
 
         # Set target rot
-        ctrl_target_wrist_euler = torch.tensor(self.cfg_task.randomize.fingertip_midpoint_rot_initial,
-                                                            device=self.device).unsqueeze(0).repeat(self.num_envs, 1)
-
         wrist_rot_noise = \
             2 * (torch.rand((self.num_envs, 3), dtype=torch.float32, device=self.device) - 0.5)  # [-1, 1]
-        wrist_rot_noise = wrist_rot_noise @ torch.diag(
-            torch.tensor(self.cfg_task.randomize.fingertip_midpoint_rot_noise, device=self.device))
-        ctrl_target_wrist_euler += wrist_rot_noise
+        ctrl_target_wrist_euler = self._gripper_rand_euler_base + wrist_rot_noise @ self._gripper_rand_rot_noise_diag
         self.ctrl_target_wrist_quat = torch_utils.quat_from_euler_xyz(
             ctrl_target_wrist_euler[:, 0],
             ctrl_target_wrist_euler[:, 1],
             ctrl_target_wrist_euler[:, 2])
 
         # Step sim and render
-        for _ in range(sim_steps):
+        pos_tol = self.cfg_task.env.gripper_move_pos_tol
+        for step in range(sim_steps):
             self.refresh_base_tensors()
             self.refresh_env_tensors()
             self._refresh_task_tensors()
@@ -429,13 +507,17 @@ class XarmTask(XarmEnv, FactoryABCTask):
                 jacobian_type=self.cfg_ctrl['jacobian_type'],
                 rot_error_type='axis_angle')
 
-            delta_hand_pose = torch.cat((pos_error, axis_angle_error), dim=-1)
-            actions = torch.zeros((self.num_envs, self.cfg_task.env.numActions), device=self.device)
-            actions[:, :6] = delta_hand_pose
+            # Stop early once all grippers are near target pos (checked every 4 steps to limit host syncs)
+            if pos_tol > 0.0 and step % 4 == 3 \
+                    and torch.max(torch.linalg.vector_norm(pos_error, dim=-1)) < pos_tol:
+                break
+
+            self._rand_actions[:, 0:3].copy_(pos_error)
+            self._rand_actions[:, 3:6].copy_(axis_angle_error)
 
             #TODO: randomize hand pose
 
-            self._apply_actions_as_ctrl_targets(actions=actions,
+            self._apply_actions_as_ctrl_targets(actions=self._rand_actions,
                                                 do_scale=False)
 
             self.gym.simulate(self.sim)
@@ -443,9 +525,53 @@ class XarmTask(XarmEnv, FactoryABCTask):
 
         self.dof_vel[env_ids, :] = torch.zeros_like(self.dof_vel[env_ids])
 
-        # Set DOF state
-        multi_env_ids_int32 = self.franka_actor_ids_sim[env_ids].flatten()
-        self.gym.set_dof_state_tensor_indexed(self.sim,
-                                              gymtorch.unwrap_tensor(self.dof_state),
-                                              gymtorch.unwrap_tensor(multi_env_ids_int32),
-                                              len(multi_env_ids_int32))
+
+#####################################################################
+###=========================jit functions=========================###
+#####################################################################
+
+
+@torch.jit.script
+def compute_keypoint_dist(keypoints_nut, keypoints_gripper):
+    # type: (Tensor, Tensor) -> Tensor
+
+    return torch.linalg.vector_norm(keypoints_nut - keypoints_gripper, dim=-1).sum(dim=-1)
+
+
+@torch.jit.script
+def compute_xarm_reward(keypoints_nut, keypoints_gripper, actions, keypoint_reward_scale, action_penalty_scale):
+    # type: (Tensor, Tensor, Tensor, float, float) -> Tensor
+
+    keypoint_reward = -compute_keypoint_dist(keypoints_nut, keypoints_gripper)
+    action_penalty = torch.linalg.vector_norm(actions, dim=-1)
+
+    return (keypoint_reward * keypoint_reward_scale).sub_(action_penalty, alpha=action_penalty_scale)
+
+
+@torch.jit.script
+def compute_wrist_ctrl_targets(actions, wrist_pos, wrist_quat, pos_action_scale_diag, rot_action_scale_diag,
+                               identity_quat, do_scale, clamp_rot, clamp_rot_thresh):
+    # type: (Tensor, Tensor, Tensor, Tensor, Tensor, Tensor, bool, bool, float) -> Tuple[Tensor, Tensor]
+
+    # Interpret actions as target pos displacements and set pos target
+    pos_actions = actions[:, 0:3]
+    if do_scale:
+        pos_actions = pos_actions @ pos_action_scale_diag
+    ctrl_target_wrist_pos = wrist_pos + pos_actions
+
+    # Interpret actions as target rot (axis-angle) displacements
+    rot_actions = actions[:, 3:6]
+    if do_scale:
+        rot_actions = rot_actions @ rot_action_scale_diag
+
+    # Convert to quat and set rot target
+    angle = torch.linalg.vector_norm(rot_actions, dim=-1, keepdim=True)
+    axis = rot_actions / angle.clamp_min(1.0e-9)  # safe divide for near-zero rotations
+    rot_actions_quat = quat_from_angle_axis(angle.squeeze(-1), axis)
+    if clamp_rot:
+        rot_actions_quat = torch.where(angle > clamp_rot_thresh,
+                                       rot_actions_quat,
+                                       identity_quat)
+    ctrl_target_wrist_quat = quat_mul(rot_actions_quat, wrist_quat)
+
+    return ctrl_target_wrist_pos, ctrl_target_wrist_quat